@@ -1,4 +1,3 @@
-import ast
 import numpy as np
 import pandas as pd
 from ci_mapping.data.mag_orm import (
@@ -29,13 +28,12 @@ def clean_data(s):
     # Some columns have null values registered as 'NaN'
     mag["bibtex_doc_type"] = mag.bibtex_doc_type.replace("NaN", np.nan)
     mag["publisher"] = mag.publisher.replace("NaN", np.nan)
-    mag["references"] = mag.references.replace("NaN", np.nan)
     mag["abstract"] = mag.abstract.replace("NaN", np.nan)
     mag["doi"] = mag.doi.replace("NaN", np.nan)
 
-    # String to list
+    # Missing references are stored as NULL
     mag["references"] = mag.references.apply(
-        lambda x: ast.literal_eval(x) if isinstance(x, str) else np.nan
+        lambda x: x if isinstance(x, list) else np.nan
     )
 
     # Change the publication and the bibtex document types
@@ -1,13 +1,41 @@
 import logging
 import psycopg2
-from sqlalchemy import create_engine, exc
+from sqlalchemy import create_engine, exc, text
 from dotenv import load_dotenv, find_dotenv
 import os
-from ci_mapping.data.mag_orm import Base
+from ci_mapping.data.mag_orm import Base, Paper, Reference
 
 load_dotenv(find_dotenv())
 
 
+def migrate_references_to_jsonb(engine):
+    """Convert the references columns of tables created before they were JSONB.
+    create_all does not alter existing columns, so TEXT columns holding
+    json.dumps() strings, or 'NaN' for missing references, are converted in place.
+
+    Args:
+        engine (`sqlalchemy.engine.Engine`): Connection to the database.
+
+    """
+    with engine.begin() as conn:
+        for table in (Paper.__tablename__, Reference.__tablename__):
+            data_type = conn.execute(
+                text(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = :table AND column_name = 'references'"
+                ),
+                table=table,
+            ).scalar()
+            if data_type == "text":
+                logging.info(f"Converting {table}.references to JSONB")
+                conn.execute(
+                    text(
+                        f'ALTER TABLE {table} ALTER COLUMN "references" TYPE jsonb '
+                        "USING CAST(NULLIF(\"references\", 'NaN') AS jsonb)"
+                    )
+                )
+
+
 def create_db_and_tables(db):
     """Create a database and tables if they don't exist.
 
@@ -32,6 +60,7 @@ def create_db_and_tables(db):
     db_config = os.getenv(db)
     engine = create_engine(db_config)
     Base.metadata.create_all(engine)
+    migrate_references_to_jsonb(engine)
 
 
 if __name__ == "__main__":
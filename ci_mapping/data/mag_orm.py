@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.dialects.postgresql import TEXT, VARCHAR, TSVECTOR
+from sqlalchemy.dialects.postgresql import TEXT, VARCHAR, TSVECTOR, JSONB
 from sqlalchemy import Column, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import Integer, Date, Boolean, Float, BIGINT
@@ -19,9 +19,7 @@ class Paper(Base):
     year = Column(TEXT)
     date = Column(TEXT)
     citations = Column(Integer)
-    references = Column(
-        TEXT
-    )  # This is transformed from list to string using json.dumps().
+    references = Column(JSONB(none_as_null=True))  # List of referenced paper IDs.
     doi = Column(VARCHAR(200))
     publisher = Column(TEXT)
     bibtex_doc_type = Column(TEXT)
@@ -213,9 +211,7 @@ class Reference(Base):
     year = Column(TEXT)
     date = Column(TEXT)
     citations = Column(Integer)
-    references = Column(
-        TEXT
-    )  # This is transformed from list to string using json.dumps().
+    references = Column(JSONB(none_as_null=True))  # List of referenced paper IDs.
     doi = Column(VARCHAR(200))
     publisher = Column(TEXT)
     bibtex_doc_type = Column(TEXT)
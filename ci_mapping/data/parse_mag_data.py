@@ -1,11 +1,32 @@
 """
 Parses data from a MAG API response (JSON format). There are modules to parse papers, affiliations journals, fields of study and authors.
 """
-import json
 import logging
+from collections import namedtuple
 import numpy as np
 from ci_mapping.utils.utils import inverted2abstract
 
+# (output key, MAG attribute) pairs that are always present in a paper response.
+_PAPER_FIELDS = (
+    ("id", "Id"),
+    ("prob", "prob"),
+    ("title", "Ti"),
+    ("publication_type", "Pt"),
+    ("year", "Y"),
+    ("date", "D"),
+    ("citations", "CC"),
+)
+
+# Rows parsed from a paper's authors and fields of study. Field names match the
+# columns of the respective tables in mag_orm, so rows can be inserted with
+# row._asdict().
+AuthorRow = namedtuple("AuthorRow", "id name")
+PaperAuthorRow = namedtuple("PaperAuthorRow", "paper_id author_id order")
+FosRow = namedtuple("FosRow", "id name norm_name")
+PaperFosRow = namedtuple("PaperFosRow", "field_of_study_id paper_id")
+AffiliationRow = namedtuple("AffiliationRow", "id affiliation")
+PaperAuthorAffRow = namedtuple("PaperAuthorAffRow", "affiliation_id author_id paper_id")
+
 
 def parse_papers(response):
     """Parse paper information from a MAG API response.
@@ -17,48 +38,43 @@ def parse_papers(response):
         d (dict): Paper metadata.
 
     """
-    remappings = {
-        "id": "Id",
-        "prob": "prob",
-        "title": "Ti",
-        "publication_type": "Pt",
-        "year": "Y",
-        "date": "D",
-        "citations": "CC",
-    }
-
-    d = {k: response[v] for k, v in remappings.items()}
+    d = {k: response[v] for k, v in _PAPER_FIELDS}
 
     # Some MAG fields might be empty - replace empty values with np.nan
-    try:
-        d["doi"] = response["DOI"]
-    except KeyError as e:
-        # logging.info(f"{response['Id']}: {e}")
-        d["doi"] = np.nan
-    try:
-        d["bibtex_doc_type"] = response["BT"]
-    except KeyError as e:
-        # logging.info(f"{response['Id']}: {e}")
-        d["bibtex_doc_type"] = np.nan
-    try:
-        d["references"] = json.dumps(response["RId"])
-    except KeyError as e:
-        # logging.info(f"{response['Id']}: {e}")
-        d["references"] = np.nan
-    try:
-        d["abstract"] = inverted2abstract(response["IA"])
-    except KeyError as e:
-        # logging.info(f"{response['Id']}: {e}")
-        d["abstract"] = np.nan
-    try:
-        d["publisher"] = response["PB"]
-    except KeyError as e:
-        # logging.info(f"{response['Id']}: {e}")
-        d["publisher"] = np.nan
+    d["doi"] = response.get("DOI", np.nan)
+    d["bibtex_doc_type"] = response.get("BT", np.nan)
+    # Stored as is in a JSONB column, None when missing
+    d["references"] = response.get("RId")
+    ia = response.get("IA")
+    d["abstract"] = inverted2abstract(ia) if ia is not None else np.nan
+    d["publisher"] = response.get("PB", np.nan)
 
     return d
 
 
+def parse_papers_batch(responses):
+    """Parse paper information from a list of MAG API responses into columns.
+    Papers are parsed with parse_papers and collected with one list per field
+    instead of one dictionary per paper, so they can be passed directly to
+    pd.DataFrame.
+
+    Args:
+        responses (:obj:`list` of json): Responses from MAG API in JSON format.
+            Each one contains paper information.
+
+    Returns:
+        columns (:obj:`dict` of :obj:`list`): Paper metadata, one list per field.
+            Empty if there are no responses.
+
+    """
+    columns = {}
+    for response in responses:
+        for k, v in parse_papers(response).items():
+            columns.setdefault(k, []).append(v)
+
+    return columns
+
+
 def parse_conference(response, paper_id):
     """Parse conference information from a MAG API response.
 
@@ -103,20 +119,18 @@ def parse_authors(response, paper_id):
         paper_id (int): Paper ID.
 
     Returns:
-        authors (:obj:`list` of :obj:`dict`): List of dictionaries with author information.
-            There's one dictionary per author.
-        paper_with_authors (:obj:`list` of :obj:`dict`): Matching paper and author IDs.
+        authors (:obj:`list` of :obj:`AuthorRow`): Author information.
+            There's one row per author.
+        paper_with_authors (:obj:`list` of :obj:`PaperAuthorRow`): Matching paper and author IDs.
 
     """
     authors = []
     paper_with_authors = []
     for author in response["AA"]:
         # mag_paper_authors
-        paper_with_authors.append(
-            {"paper_id": paper_id, "author_id": author["AuId"], "order": author["S"]}
-        )
+        paper_with_authors.append(PaperAuthorRow(paper_id, author["AuId"], author["S"]))
         # mag_authors
-        authors.append({"id": author["AuId"], "name": author["DAuN"]})
+        authors.append(AuthorRow(author["AuId"], author["DAuN"]))
 
     return authors, paper_with_authors
 
@@ -129,9 +143,9 @@ def parse_fos(response, paper_id):
         paper_id (int): Paper ID.
 
     Returns:
-        fields_of_study (:obj:`list` of :obj:`dict`): List of dictionaries with fields of study information.
-            There's one dictionary per field of study.
-        paper_with_fos (:obj:`list` of :obj:`dict`): Matching fields of study and paper IDs.
+        fields_of_study (:obj:`list` of :obj:`FosRow`): Fields of study information.
+            There's one row per field of study.
+        paper_with_fos (:obj:`list` of :obj:`PaperFosRow`): Matching fields of study and paper IDs.
 
     """
     # two outputs: fos_id with fos_name, fos_id with paper_id
@@ -139,11 +153,9 @@ def parse_fos(response, paper_id):
     fields_of_study = []
     for fos in response["F"]:
         # mag_fields_of_study
-        fields_of_study.append(
-            {"id": fos["FId"], "name": fos["DFN"], "norm_name": fos["FN"]}
-        )
+        fields_of_study.append(FosRow(fos["FId"], fos["DFN"], fos["FN"]))
         # mag_paper_fields_of_study
-        paper_with_fos.append({"field_of_study_id": fos["FId"], "paper_id": paper_id})
+        paper_with_fos.append(PaperFosRow(fos["FId"], paper_id))
 
     return paper_with_fos, fields_of_study
 
@@ -156,31 +168,61 @@ def parse_affiliations(response, paper_id):
         paper_id (int): Paper ID.
 
     Returns:
-        affiliations (:obj:`list` of :obj:`dict`): List of dictionaries with affiliation information.
-            There's one dictionary per field of study.
-       author_with_aff (:obj:`list` of :obj:`dict`): Matching affiliation and author IDs.
+        affiliations (:obj:`list` of :obj:`AffiliationRow`): Affiliation information.
+            There's one row per affiliation.
+       author_with_aff (:obj:`list` of :obj:`PaperAuthorAffRow`): Matching affiliation and author IDs.
 
     """
     affiliations = []
     paper_author_aff = []
     for aff in response["AA"]:
-        if aff["AfId"]:
+        afid = aff["AfId"]
+        auid = aff["AuId"]
+        if afid:
             # mag_author_affiliation
-            paper_author_aff.append(
-                {
-                    "affiliation_id": aff["AfId"],
-                    "author_id": aff["AuId"],
-                    "paper_id": paper_id,
-                }
-            )
+            paper_author_aff.append(PaperAuthorAffRow(afid, auid, paper_id))
             # mag_affiliation
-            affiliations.append({"id": aff["AfId"], "affiliation": aff["AfN"]})
+            affiliations.append(AffiliationRow(afid, aff["AfN"]))
         else:
-            paper_author_aff.append(
-                {
-                    "affiliation_id": None,
-                    "author_id": aff["AuId"],
-                    "paper_id": paper_id,
-                }
-            )
+            paper_author_aff.append(PaperAuthorAffRow(None, auid, paper_id))
     return affiliations, paper_author_aff
+
+
+def parse_authors_and_affiliations(response, paper_id):
+    """Parse author and affiliation information from a MAG API response in a
+    single pass over the paper's authors. Equivalent to calling parse_authors and
+    parse_affiliations.
+
+    Args:
+        response (json): Response from MAG API in JSON format. Contains all paper information.
+        paper_id (int): Paper ID.
+
+    Returns:
+        authors (:obj:`list` of :obj:`AuthorRow`): Author information.
+            There's one row per author.
+        paper_with_authors (:obj:`list` of :obj:`PaperAuthorRow`): Matching paper and author IDs.
+        affiliations (:obj:`list` of :obj:`AffiliationRow`): Affiliation information.
+        paper_author_aff (:obj:`list` of :obj:`PaperAuthorAffRow`): Matching affiliation,
+            author and paper IDs.
+
+    """
+    authors = []
+    paper_with_authors = []
+    affiliations = []
+    paper_author_aff = []
+    for aff in response["AA"]:
+        afid = aff["AfId"]
+        auid = aff["AuId"]
+        # mag_paper_authors
+        paper_with_authors.append(PaperAuthorRow(paper_id, auid, aff["S"]))
+        # mag_authors
+        authors.append(AuthorRow(auid, aff["DAuN"]))
+        if afid:
+            # mag_author_affiliation
+            paper_author_aff.append(PaperAuthorAffRow(afid, auid, paper_id))
+            # mag_affiliation
+            affiliations.append(AffiliationRow(afid, aff["AfN"]))
+        else:
+            paper_author_aff.append(PaperAuthorAffRow(None, auid, paper_id))
+
+    return authors, paper_with_authors, affiliations, paper_author_aff
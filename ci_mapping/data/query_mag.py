@@ -1,9 +1,58 @@
+import io
 import requests
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
 from retrying import retry
 
+# Prefer the fastest available JSON parser. All of them accept raw bytes.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
 ENDPOINT = "https://api.labs.cognitive.microsoft.com/academic/v1.0/evaluate"
 
+# Sessions used to query the MAG API, one per thread.
+_local = threading.local()
+
+# Extracts the ID from the parent and child entries of a field of study.
+_field_of_study_id = itemgetter("FId")
+
+# Marks an exhausted iterator, as None can be a valid query item.
+_EMPTY = object()
+
+
+def _session():
+    """Session of the current thread, which reuses its connection to the MAG API
+    across paged queries. requests does not guarantee that a Session can be shared
+    between threads, so every thread gets its own. Retries are handled by the retry
+    decorator on query_mag_api.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        _local.session = session
+    return session
+
+
+@lru_cache(maxsize=4)
+def _headers(subscription_key):
+    """Request headers for the MAG API, shared between calls with the same key."""
+    return {
+        "Ocp-Apim-Subscription-Key": subscription_key,
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+
 
 def build_composite_expr(query_values, entity_name, date):
     """Builds a composite expression with ANDs in OR to be used as MAG query.
@@ -18,12 +67,9 @@ def build_composite_expr(query_values, entity_name, date):
 
     """
     query_prefix_format = "expr=OR({})"
+    start_date, end_date = date
     and_queries = [
-        "".join(
-            [
-                f"And(Composite({entity_name}='{query_value}'), D=['{date[0]}', '{date[1]}'])"
-            ]
-        )
+        f"And(Composite({entity_name}='{query_value}'), D=['{start_date}', '{end_date}'])"
         for query_value in query_values
     ]
     return query_prefix_format.format(", ".join(and_queries))
@@ -45,22 +91,21 @@ def query_mag_api(expr, fields, subscription_key, query_count=1000, offset=0):
                 If there are no results 'entities' is an empty list.
 
     """
-    headers = {
-        "Ocp-Apim-Subscription-Key": subscription_key,
-        "Content-Type": "application/x-www-form-urlencoded",
-    }
     query = f"{expr}&count={query_count}&offset={offset}&attributes={','.join(fields)}"
 
-    r = requests.post(ENDPOINT, data=query.encode("utf-8"), headers=headers)
+    r = _session().post(
+        ENDPOINT, data=query.encode("utf-8"), headers=_headers(subscription_key)
+    )
     r.raise_for_status()
 
-    return r.json()
+    # Parse the raw bytes directly, skipping requests' encoding detection.
+    return json_loads(r.content)
 
 
 def build_expr(query_items, entity_name, max_length=16000):
     """Builds and yields OR expressions for MAG from a list of items. Strings and
     integer items are formatted quoted and unquoted respectively, as per the MAG query
-    specification.
+    specification. All items are expected to be of the same type.
 
     The maximum accepted query length for the api appears to be around 16,000 characters.
 
@@ -74,28 +119,37 @@ def build_expr(query_items, entity_name, max_length=16000):
         (:obj:`str`): Expression in the format expr=OR(entity_name=item1, entity_name=item2...).
 
     """
-    expr = []
-    length = 0
+    # items are written to a buffer as they come instead of being joined at yield
+    expr = io.StringIO()
+    running_length = 0
     query_prefix_format = "expr=OR({})"
 
-    for item in query_items:
-        if type(item) == str:
-            formatted_item = f"{entity_name}='{item}'"
-        elif type(item) == int:
-            formatted_item = f"{entity_name}={item}"
-        length = (
-            sum(len(e) + 1 for e in expr)
-            + len(formatted_item)
-            + len(query_prefix_format)
-        )
+    # query_items are homogeneous, so the format is picked from the first item
+    query_items = iter(query_items)
+    first_item = next(query_items, _EMPTY)
+    if first_item is _EMPTY:
+        return
+    if isinstance(first_item, str):
+        item_format = f"{entity_name}='{{}}'"
+    else:
+        item_format = f"{entity_name}={{}}"
+
+    for item in chain([first_item], query_items):
+        formatted_item = item_format.format(item)
+        length = running_length + len(formatted_item) + len(query_prefix_format)
         if length >= max_length:
-            yield query_prefix_format.format(",".join(expr))
-            expr.clear()
-        expr.append(formatted_item)
+            yield query_prefix_format.format(expr.getvalue())
+            expr = io.StringIO()
+            running_length = 0
+        if running_length > 0:
+            expr.write(",")
+        expr.write(formatted_item)
+        # length of the items written so far, including their separators
+        running_length += len(formatted_item) + 1
 
     # pick up any remainder below max_length
-    if len(expr) > 0:
-        yield query_prefix_format.format(",".join(expr))
+    if running_length > 0:
+        yield query_prefix_format.format(expr.getvalue())
 
 
 def query_fields_of_study(
@@ -106,6 +160,7 @@ def query_fields_of_study(
     # id, display_name, level, parent_ids, children_ids
     query_count=1000,
     results_limit=None,
+    prefetch_pages=1,
 ):
     """Queries the MAG for fields of study. Expect >650k results for all levels.
 
@@ -117,6 +172,9 @@ def query_fields_of_study(
         query_count (int): number of items to return from each query
         results_limit (int): break and return as close to this number of results as the
             offset and query_count allow (for testing)
+        prefetch_pages (int): number of pages requested concurrently, so that the
+            next pages are downloaded while the current one is processed. The default
+            of 1 pages sequentially.
 
     Returns:
         (:obj:`list` of `dict`): processed results from the api query
@@ -128,60 +186,76 @@ def query_fields_of_study(
         expr_args = (levels, "FL")
     else:
         raise TypeError("Field of study ids OR levels should be supplied")
+    if prefetch_pages < 1:
+        raise ValueError("prefetch_pages should be at least 1")
+
+    with ThreadPoolExecutor(max_workers=prefetch_pages) as executor:
+        for expr in build_expr(*expr_args):
+            count = 1000
+            offset = 0
+
+            def fetch(page_offset):
+                return executor.submit(
+                    query_mag_api,
+                    expr,
+                    fields,
+                    subscription_key=subscription_key,
+                    query_count=count,
+                    offset=page_offset,
+                )
+
+            def fetch_from(page_offset):
+                # keep the next pages in flight while the current one is processed
+                return deque(
+                    fetch(page_offset + i * count) for i in range(prefetch_pages)
+                )
+
+            pages = fetch_from(offset)
+            while True:
+                fos_data = pages.popleft().result()
+                entities = fos_data["entities"]
+                if not entities:
+                    logging.info("Empty entities returned, no more data")
+                    for page in pages:
+                        page.cancel()
+                    break
+
+                next_offset = offset + len(entities)
+                if len(entities) == count:
+                    pages.append(fetch(next_offset + len(pages) * count))
+                else:
+                    # a short page moves the offsets of the pages queued after it
+                    for page in pages:
+                        page.cancel()
+                    pages = fetch_from(next_offset)
+
+                # clean up and formatting
+                for row in entities:
+                    fos = {"id": row["Id"], "name": row["DFN"], "level": row["FL"]}
+                    # no parents and/or children if the fields are missing
+                    if "FP" in row:
+                        fos["parent_ids"] = list(map(_field_of_study_id, row["FP"]))
+                    if "FC" in row:
+                        fos["child_ids"] = list(map(_field_of_study_id, row["FC"]))
+
+                    yield fos
+
+                offset = next_offset
+                logging.info(offset)
+
+                if results_limit is not None and offset >= results_limit:
+                    for page in pages:
+                        page.cancel()
+                    break
 
-    field_mapping = {
-        "Id": "id",
-        "DFN": "name",
-        "FL": "level",
-        "FP": "parent_ids",
-        "FC": "child_ids",
-    }
-    fields_to_drop = ["logprob", "prob"]
-    fields_to_compact = ["parent_ids", "child_ids"]
-
-    for expr in build_expr(*expr_args):
-        count = 1000
-        offset = 0
-        while True:
-            fos_data = query_mag_api(
-                expr,
-                fields,
-                subscription_key=subscription_key,
-                query_count=count,
-                offset=offset,
-            )
-            if fos_data["entities"] == []:
-                logging.info("Empty entities returned, no more data")
-                break
-
-            # clean up and formatting
-            for row in fos_data["entities"]:
-                for f in fields_to_drop:
-                    del row[f]
-
-                for code, description in field_mapping.items():
-                    try:
-                        row[description] = row.pop(code)
-                    except KeyError:
-                        pass
-
-                for field in fields_to_compact:
-                    try:
-                        row[field] = [ids["FId"] for ids in row[field]]
-                    except KeyError:
-                        # no parents and/or children
-                        pass
-
-                # logging.info(f"new fos: {row}")
-                yield row
-
-            offset += len(fos_data["entities"])
-            logging.info(offset)
-
-            if results_limit is not None and offset >= results_limit:
-                break
+def query_by_id(ids):
+    """Builds an OR expression for MAG that queries papers by their IDs.
 
+    Args:
+        ids (:obj:`list` of int): Paper IDs.
 
-def query_by_id(ids):
-    query_ids = ",".join([f"Id={id}" for id in ids])
-    return f"expr=OR({query_ids})".replace("'", "")
+    Returns:
+        (:obj:`str`): Expression in the format expr=OR(Id=id1,Id=id2...).
+
+    """
+    return "expr=OR(" + ",".join(f"Id={i}" for i in ids) + ")"
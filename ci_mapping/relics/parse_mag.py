@@ -9,7 +9,7 @@ import ci_mapping
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv, find_dotenv
-from ci_mapping.utils.utils import unique_dicts, unique_dicts_by_value, flatten_lists
+from ci_mapping.utils.utils import unique_dicts_by_value, flatten_lists
 from ci_mapping.data.parse_mag_data import (
     parse_affiliations,
     parse_authors,
@@ -68,11 +68,17 @@ if __name__ == "__main__":
 
     # Parse author information
     items = [parse_authors(response, response["Id"]) for response in data]
+    # Rows are namedtuples: deduplicate them as they are and turn them into
+    # dicts for the bulk insert.
     authors = [
-        d
-        for d in unique_dicts_by_value(flatten_lists([item[0] for item in items]), "id")
+        row._asdict()
+        for row in {
+            row.id: row for row in flatten_lists([item[0] for item in items])
+        }.values()
+    ]
+    paper_with_authors = [
+        row._asdict() for row in set(flatten_lists([item[1] for item in items]))
     ]
-    paper_with_authors = unique_dicts(flatten_lists([item[1] for item in items]))
 
     # Parse Fields of Study
     items = [
@@ -80,16 +86,20 @@ if __name__ == "__main__":
         for response in data
         if "F" in response.keys()
     ]
-    paper_with_fos = unique_dicts(flatten_lists([item[0] for item in items]))
+    paper_with_fos = [
+        row._asdict() for row in set(flatten_lists([item[0] for item in items]))
+    ]
     fields_of_study = [
-        d for d in unique_dicts(flatten_lists([item[1] for item in items]))
+        row._asdict() for row in set(flatten_lists([item[1] for item in items]))
     ]
 
     # Parse affiliations
     items = [parse_affiliations(response, response["Id"]) for response in data]
-    affiliations = [d for d in unique_dicts(flatten_lists([item[0] for item in items]))]
+    affiliations = [
+        row._asdict() for row in set(flatten_lists([item[0] for item in items]))
+    ]
     paper_author_aff = [
-        d for d in unique_dicts(flatten_lists([item[1] for item in items]))
+        row._asdict() for row in set(flatten_lists([item[1] for item in items]))
     ]
     logging.info(f"Parsing completed!")
 
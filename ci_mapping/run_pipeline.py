@@ -12,7 +12,6 @@ import glob
 import toolz
 import pickle
 import os
-import ast
 import numpy as np
 import ci_mapping
 from ci_mapping import logger
@@ -24,11 +23,10 @@ from ci_mapping.data.query_mag import (
     query_by_id,
 )
 from ci_mapping.data.geocode import place_by_id, place_by_name, parse_response
-from ci_mapping.utils.utils import unique_dicts, unique_dicts_by_value, flatten_lists
+from ci_mapping.utils.utils import unique_dicts_by_value, flatten_lists
 from ci_mapping.utils.utils import date_range, str2datetime, allocate_in_group
 from ci_mapping.data.parse_mag_data import (
-    parse_affiliations,
-    parse_authors,
+    parse_authors_and_affiliations,
     parse_fos,
     parse_journal,
     parse_papers,
@@ -327,46 +325,55 @@ class CollectiveIntelligenceFlow(FlowSpec):
         ]
         logger.info(f"Completed parsing conferences: {len(conferences)}")
 
-        # Parse author information
-        items = [parse_authors(response, response["Id"]) for response in data]
+        # Parse author and affiliation information
+        items = [
+            parse_authors_and_affiliations(response, response["Id"])
+            for response in data
+        ]
+        # Rows are namedtuples: deduplicate them as they are and turn them into
+        # dicts for the bulk insert.
         authors = [
-            d
-            for d in unique_dicts_by_value(
-                flatten_lists([item[0] for item in items]), "id"
-            )
-            if d["id"] not in author_ids
+            row._asdict()
+            for row in {
+                row.id: row for row in flatten_lists([item[0] for item in items])
+            }.values()
+            if row.id not in author_ids
         ]
 
-        paper_with_authors = unique_dicts(flatten_lists([item[1] for item in items]))
+        paper_with_authors = [
+            row._asdict() for row in set(flatten_lists([item[1] for item in items]))
+        ]
         logger.info(f"Completed parsing authors: {len(authors)}")
         logger.info(f"Completed parsing papers_with_authors: {len(paper_with_authors)}")
 
+        affiliations = [
+            row._asdict()
+            for row in set(flatten_lists([item[2] for item in items]))
+            if row.id not in aff_ids
+        ]
+        paper_author_aff = [
+            row._asdict() for row in set(flatten_lists([item[3] for item in items]))
+        ]
+        logger.info(f"Completed parsing affiliations: {len(affiliations)}")
+        logger.info(f"Completed parsing author_with_aff: {len(paper_author_aff)}")
+
         # Parse Fields of Study
         items = [
             parse_fos(response, response["Id"])
             for response in data
             if "F" in response.keys()
         ]
-        paper_with_fos = unique_dicts(flatten_lists([item[0] for item in items]))
+        paper_with_fos = [
+            row._asdict() for row in set(flatten_lists([item[0] for item in items]))
+        ]
         fields_of_study = [
-            d
-            for d in unique_dicts(flatten_lists([item[1] for item in items]))
-            if d["id"] not in fos_ids
+            row._asdict()
+            for row in set(flatten_lists([item[1] for item in items]))
+            if row.id not in fos_ids
         ]
         logger.info(f"Completed parsing fields_of_study: {len(fields_of_study)}")
         logger.info(f"Completed parsing paper_with_fos: {len(paper_with_fos)}")
 
-        # Parse affiliations
-        items = [parse_affiliations(response, response["Id"]) for response in data]
-        affiliations = [
-            d
-            for d in unique_dicts(flatten_lists([item[0] for item in items]))
-            if d["id"] not in aff_ids
-        ]
-        paper_author_aff = unique_dicts(flatten_lists([item[1] for item in items]))
-        logger.info(f"Completed parsing affiliations: {len(affiliations)}")
-        logger.info(f"Completed parsing author_with_aff: {len(paper_author_aff)}")
-
         logger.info("Parsing completed!")
 
         # Insert dicts into postgresql
@@ -604,12 +611,6 @@ class CollectiveIntelligenceFlow(FlowSpec):
         # Read mag_papers table
         df = pd.read_sql(s.query(Paper).statement, s.bind)
 
-        # Add nulls and transform to list
-        df["references"] = df["references"].apply(lambda x: np.nan if x == "NaN" else x)
-        df["references"] = df["references"].apply(
-            lambda x: ast.literal_eval(x) if isinstance(x, str) else np.nan
-        )
-
         # Get all references
         refs = []
         for references in df["references"].dropna():
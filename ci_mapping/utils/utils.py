@@ -1,5 +1,5 @@
 from itertools import chain, combinations
-from collections import OrderedDict, Counter
+from collections import Counter
 from datetime import datetime
 import numpy as np
 
@@ -15,18 +15,13 @@ def inverted2abstract(obj):
     
     """
     if isinstance(obj, dict):
-        inverted_index = obj["InvertedIndex"]
+        # Later words overwrite earlier ones that claim the same position
         d = {}
-        for k, v in inverted_index.items():
-            if len(v) == 1:
-                d[v[0]] = k
-            else:
-                for idx in v:
-                    d[idx] = k
-
-        return " ".join([v for _, v in OrderedDict(sorted(d.items())).items()]).replace(
-            "\x00", ""
-        )
+        for word, positions in obj["InvertedIndex"].items():
+            for idx in positions:
+                d[idx] = word
+
+        return " ".join([d[idx] for idx in sorted(d)]).replace("\x00", "")
     else:
         return np.nan
 
@@ -4,6 +4,8 @@ from unittest import mock
 from ci_mapping.data.query_mag import build_expr
 from ci_mapping.data.query_mag import query_mag_api
 from ci_mapping.data.query_mag import build_composite_expr
+from ci_mapping.data.query_mag import query_fields_of_study
+from ci_mapping.data.query_mag import query_by_id
 
 
 class TestBuildExpr:
@@ -19,12 +21,26 @@ class TestBuildExpr:
             "expr=OR(Id=3)",
         ]
 
+    def test_build_expr_yields_nothing_for_empty_input(self):
+        assert list(build_expr([], "Id", 1000)) == []
 
-@mock.patch("ci_mapping.data.query_mag.requests.post", autospec=True)
-def test_query_mag_api_sends_correct_request(mocked_requests):
+    def test_build_expr_keeps_none_as_first_item(self):
+        assert list(build_expr([None, 1], "FL", 1000)) == ["expr=OR(FL=None,FL=1)"]
+
+    def test_build_expr_formats_all_items_like_the_first(self):
+        assert list(build_expr(iter(["cat", "dog", "bird"]), "Ti", 30)) == [
+            "expr=OR(Ti='cat',Ti='dog')",
+            "expr=OR(Ti='bird')",
+        ]
+
+
+@mock.patch("ci_mapping.data.query_mag._session", autospec=True)
+def test_query_mag_api_sends_correct_request(mocked_session):
     sub_key = 123
     fields = ["Id", "Ti"]
     expr = "expr=OR(Id=1,Id=2)"
+    mocked_requests = mocked_session.return_value.post
+    mocked_requests.return_value.content = b'{"expr": "", "entities": []}'
     query_mag_api(expr, fields, sub_key, query_count=10, offset=0)
     expected_call_args = mock.call(
         "https://api.labs.cognitive.microsoft.com/academic/v1.0/evaluate",
@@ -37,8 +53,86 @@ def test_query_mag_api_sends_correct_request(mocked_requests):
     assert mocked_requests.call_args == expected_call_args
 
 
+@mock.patch("ci_mapping.data.query_mag.query_mag_api", autospec=True)
+def test_query_fields_of_study_formats_rows(mocked_query):
+    page = {
+        "expr": "expr=OR(Id=1,Id=2)",
+        "entities": [
+            {
+                "logprob": -1.0,
+                "prob": 0.3,
+                "Id": 1,
+                "DFN": "Biology",
+                "FL": 0,
+                "FC": [{"FId": 2}, {"FId": 3}],
+            },
+            {
+                "logprob": -2.0,
+                "prob": 0.1,
+                "Id": 2,
+                "DFN": "Biofilm",
+                "FL": 1,
+                "FP": [{"FId": 1}],
+            },
+        ],
+    }
+
+    # pages are fetched concurrently, so answer by offset rather than call order
+    mocked_query.side_effect = lambda *args, offset, **kwargs: (
+        page if offset == 0 else {"expr": "expr=OR(Id=1,Id=2)", "entities": []}
+    )
+
+    assert list(query_fields_of_study(123, ids=[1, 2])) == [
+        {"id": 1, "name": "Biology", "level": 0, "child_ids": [2, 3]},
+        {"id": 2, "name": "Biofilm", "level": 1, "parent_ids": [1]},
+    ]
+    assert [c.kwargs["offset"] for c in mocked_query.call_args_list] == [0, 2]
+
+
+def mock_pages(mocked_query, page_sizes):
+    row = {"logprob": -1.0, "prob": 0.3, "Id": 1, "DFN": "Biology", "FL": 0}
+    # answer by offset, as prefetched pages can be requested in any order
+    mocked_query.side_effect = lambda *args, offset, **kwargs: {
+        "expr": "expr=OR(Id=1)",
+        "entities": [row] * page_sizes.get(offset, 0),
+    }
+
+
+@mock.patch("ci_mapping.data.query_mag.query_mag_api", autospec=True)
+def test_query_fields_of_study_continues_after_partial_page(mocked_query):
+    mock_pages(mocked_query, {0: 1000, 1000: 500, 1500: 3})
+
+    assert len(list(query_fields_of_study(123, ids=[1]))) == 1503
+    assert [c.kwargs["offset"] for c in mocked_query.call_args_list] == [
+        0,
+        1000,
+        1500,
+        1503,
+    ]
+
+
+@mock.patch("ci_mapping.data.query_mag.query_mag_api", autospec=True)
+def test_query_fields_of_study_prefetches_from_partial_page(mocked_query):
+    mock_pages(mocked_query, {0: 1000, 1000: 500, 1500: 3})
+
+    assert len(list(query_fields_of_study(123, ids=[1], prefetch_pages=2))) == 1503
+    # pages queued after a partial page are cancelled, but may have been requested
+    requested = {c.kwargs["offset"] for c in mocked_query.call_args_list}
+    assert {0, 1000, 1500, 1503} <= requested
+    assert requested <= {0, 1000, 1500, 1503, 2000, 2500, 2503}
+
+
+def test_query_fields_of_study_requires_a_page_to_prefetch():
+    with pytest.raises(ValueError):
+        list(query_fields_of_study(123, ids=[1], prefetch_pages=0))
+
+
 def test_build_composite_queries_correctly():
     assert (
         build_composite_expr(["bar", "foo"], "F.FN", ("2019-01-01", "2019-02-22"))
         == "expr=OR(And(Composite(F.FN='bar'), D=['2019-01-01', '2019-02-22']), And(Composite(F.FN='foo'), D=['2019-01-01', '2019-02-22']))"
     )
+
+
+def test_query_by_id_correctly_forms_query():
+    assert query_by_id((1, 2)) == "expr=OR(Id=1,Id=2)"
@@ -4,6 +4,7 @@ import os
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 from ci_mapping.data.mag_orm import Base
+from ci_mapping.data.create_db_and_tables import migrate_references_to_jsonb
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
@@ -26,6 +27,24 @@ class TestMag(unittest.TestCase):
     def test_build(self):
         pass
 
+    def test_migrate_references_to_jsonb(self):
+        """TEXT references written with json.dumps() are converted to JSONB"""
+        with self.engine.begin() as conn:
+            conn.execute(
+                'ALTER TABLE mag_papers ALTER COLUMN "references" TYPE text '
+                'USING "references"::text'
+            )
+            conn.execute(
+                'INSERT INTO mag_papers (id, "references") '
+                "VALUES (1, '[2, 3]'), (2, 'NaN')"
+            )
+
+        migrate_references_to_jsonb(self.engine)
+
+        with self.engine.connect() as conn:
+            rows = dict(conn.execute('SELECT id, "references" FROM mag_papers'))
+        self.assertEqual(rows, {1: [2, 3], 2: None})
+
 
 if __name__ == "__main__":
     unittest.main()
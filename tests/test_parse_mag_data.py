@@ -2,8 +2,10 @@ import pytest
 
 import numpy as np
 from ci_mapping.data.parse_mag_data import parse_papers
+from ci_mapping.data.parse_mag_data import parse_papers_batch
 from ci_mapping.data.parse_mag_data import parse_affiliations
 from ci_mapping.data.parse_mag_data import parse_authors
+from ci_mapping.data.parse_mag_data import parse_authors_and_affiliations
 from ci_mapping.data.parse_mag_data import parse_fos
 from ci_mapping.data.parse_mag_data import parse_journal
 
@@ -49,7 +51,7 @@ def test_parse_papers():
         "date": "2017-03-03",
         "citations": 109,
         "bibtex_doc_type": "a",
-        "references": "[2293000460, 2296125569]",
+        "references": [2293000460, 2296125569],
         "publisher": "American Association for the Advancement of Science",
         "abstract": np.nan,
     }
@@ -58,6 +60,32 @@ def test_parse_papers():
     assert result == expected_result
 
 
+def test_parse_papers_missing_fields():
+    response = {
+        k: v
+        for k, v in test_example.items()
+        if k not in {"DOI", "BT", "RId", "PB", "IA"}
+    }
+    result = parse_papers(response)
+
+    for field in ["doi", "bibtex_doc_type", "publisher", "abstract"]:
+        assert np.isnan(result[field])
+    assert result["references"] is None
+
+
+def test_parse_papers_batch():
+    responses = [test_example, {k: v for k, v in test_example.items() if k != "DOI"}]
+    expected_rows = [parse_papers(response) for response in responses]
+
+    result = parse_papers_batch(responses)
+
+    assert result.keys() == expected_rows[0].keys()
+    for field, values in result.items():
+        assert len(values) == 2
+        for value, row in zip(values, expected_rows):
+            assert value == row[field] or (np.isnan(value) and np.isnan(row[field]))
+
+
 def test_parse_journal():
     expected_result = {"id": 3880285, "journal_name": "science", "paper_id": 2592122940}
     result = parse_journal(test_example, 2592122940)
@@ -76,8 +104,10 @@ def test_parse_authors():
     ]
     result_authors, result_paper_with_authors = parse_authors(test_example, 2592122940)
 
-    assert result_authors == expected_result_authors
-    assert result_paper_with_authors == expected_result_paper_with_authors
+    assert [row._asdict() for row in result_authors] == expected_result_authors
+    assert [
+        row._asdict() for row in result_paper_with_authors
+    ] == expected_result_paper_with_authors
 
 
 def test_parse_fields_of_study():
@@ -91,8 +121,12 @@ def test_parse_fields_of_study():
     ]
     result_paper_with_fos, result_fields_of_study = parse_fos(test_example, 2592122940)
 
-    assert expected_result_paper_with_fos == result_paper_with_fos
-    assert expected_result_fields_of_study == result_fields_of_study
+    assert expected_result_paper_with_fos == [
+        row._asdict() for row in result_paper_with_fos
+    ]
+    assert expected_result_fields_of_study == [
+        row._asdict() for row in result_fields_of_study
+    ]
 
 
 def test_parse_affiliations():
@@ -106,5 +140,28 @@ def test_parse_affiliations():
 
     affiliations, paper_author_aff = parse_affiliations(test_example, 2592122940)
 
-    assert affiliations == expected_result_affiliations
-    assert paper_author_aff == expected_result_author_with_aff
+    assert [row._asdict() for row in affiliations] == expected_result_affiliations
+    assert [
+        row._asdict() for row in paper_author_aff
+    ] == expected_result_author_with_aff
+
+
+def test_parse_authors_and_affiliations():
+    expected_authors, expected_paper_with_authors = parse_authors(
+        test_example, 2592122940
+    )
+    expected_affiliations, expected_paper_author_aff = parse_affiliations(
+        test_example, 2592122940
+    )
+
+    (
+        authors,
+        paper_with_authors,
+        affiliations,
+        paper_author_aff,
+    ) = parse_authors_and_affiliations(test_example, 2592122940)
+
+    assert authors == expected_authors
+    assert paper_with_authors == expected_paper_with_authors
+    assert affiliations == expected_affiliations
+    assert paper_author_aff == expected_paper_author_aff
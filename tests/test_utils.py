@@ -6,6 +6,7 @@ from ci_mapping.utils.utils import unique_dicts
 from ci_mapping.utils.utils import unique_dicts_by_value
 from ci_mapping.utils.utils import cooccurrence_graph
 from ci_mapping.utils.utils import allocate_in_group
+from ci_mapping.utils.utils import inverted2abstract
 
 example_list_dict = [
     {"DFN": "Biology", "FId": 86803240},
@@ -83,3 +84,27 @@ def test_allocate_in_groups_ai_ci():
     result = allocate_in_group(lst, ai_lst)
 
     assert result == expected_result
+
+
+def test_inverted2abstract():
+    inverted_abstract = {
+        "IndexLength": 7,
+        "InvertedIndex": {
+            "the": [0, 4],
+            "cat": [1],
+            "sat": [2],
+            "on": [3],
+            "mat": [5],
+            "rug": [5],
+            "today\x00": [6],
+        },
+    }
+
+    result = inverted2abstract(inverted_abstract)
+
+    assert result == "the cat sat on the rug today"
+
+
+def test_inverted2abstract_without_positions():
+    assert inverted2abstract({"InvertedIndex": {}}) == ""
+    assert inverted2abstract({"InvertedIndex": {"a": []}}) == ""